@@ -1,3 +1,27 @@
+import math
+import operator
+import time
+from types import MappingProxyType
+
+_PRICES = {
+    'AAPL': 150.0,
+    'TSLA': 800.0,
+    'GOOGL': 2500.0
+}
+
+# Symbols that can be traded, in the order the UI lists them
+SUPPORTED_SYMBOLS = tuple(_PRICES)
+
+# Column names of the transaction log; share trades fill every column while
+# deposits and withdrawals leave symbol, quantity and price as None
+_TX_FIELDS = ('type', 'symbol', 'quantity', 'price', 'amount', 'timestamp')
+
+# Prices in integer cents, rebuilt from _PRICES by refresh_prices()
+_PRICES_CENTS = {}
+
+# Bumped whenever prices change so accounts know to revalue their holdings
+_price_version = 0
+
 def get_share_price(symbol):
     """Returns the current price of a share for the given symbol.
     
@@ -9,20 +33,62 @@ def get_share_price(symbol):
     Returns:
         float: The current price of the share
     """
-    prices = {
-        'AAPL': 150.0,
-        'TSLA': 800.0,
-        'GOOGL': 2500.0
-    }
-    return prices.get(symbol, 0.0)
+    return _price_cents(symbol) / 100
+
+def _price_cents(symbol):
+    """Return the price for a symbol in integer cents, or 0 if it is unknown.
+    
+    Call ``refresh_prices()`` after changing ``_PRICES``.
+    """
+    return _PRICES_CENTS.get(symbol, 0)
+
+def to_cents(amount):
+    """Convert a dollar amount to the integer cents the account records.
+    
+    Args:
+        amount (float): The dollar amount
+        
+    Returns:
+        int: The amount rounded to the nearest cent
+        
+    Raises:
+        ValueError: If the amount is infinite, NaN, or too large to express in cents
+    """
+    cents = amount * 100
+    if not math.isfinite(cents):
+        raise ValueError(f"Amount must be finite: {amount}")
+    return round(cents)
+
+def refresh_prices():
+    """Rebuild the cents price table and mark every account's holdings value as stale."""
+    global _PRICES_CENTS, _price_version
+    _PRICES_CENTS = {symbol: to_cents(price) for symbol, price in _PRICES.items()}
+    _price_version += 1
+
+refresh_prices()
+
+def get_price_version():
+    """Return a counter that changes whenever ``refresh_prices()`` runs.
+    
+    Callers that cache anything derived from prices can compare it against the
+    value they saw to tell whether their cache is stale.
+    
+    Returns:
+        int: The current price version
+    """
+    return _price_version
 
 class Account:
     """A class that models a user's account in a trading simulation platform.
     
     It handles fund management, share transactions, and provides methods for
-    generating reports regarding the user's financial activities.
+    generating reports regarding the user's financial activities. Money is held
+    internally as integer cents so balances and profit/loss stay exact.
     """
     
+    __slots__ = ('user_id', '_balance_cents', '_initial_deposit_cents', 'holdings', '_tx',
+                 '_holdings_value_cents', '_holdings_value_version')
+    
     def __init__(self, user_id, initial_deposit):
         """Initialize a new Account object.
         
@@ -30,33 +96,103 @@ class Account:
             user_id (str): Unique identifier for the user
             initial_deposit (float): The initial deposit amount at account creation
         """
+        initial_deposit_cents = to_cents(initial_deposit)
         self.user_id = user_id
-        self.balance = initial_deposit
-        self.initial_deposit = initial_deposit
+        self._balance_cents = initial_deposit_cents
+        self._initial_deposit_cents = initial_deposit_cents
         self.holdings = {}
-        self.transactions = []
+        self._tx = {field: [] for field in _TX_FIELDS}
+        
+        # Running market value of the holdings, kept in step by buy/sell
+        self._holdings_value_cents = 0
+        self._holdings_value_version = _price_version
         
         # Record the initial deposit as a transaction
-        self.transactions.append({
-            'type': 'deposit',
-            'amount': initial_deposit,
-            'timestamp': 'initial deposit'
-        })
+        self._record_transaction('deposit', initial_deposit_cents)
+    
+    @property
+    def balance(self):
+        """float: The current cash balance."""
+        return self._balance_cents / 100
+    
+    @property
+    def initial_deposit(self):
+        """float: The initial deposit amount at account creation."""
+        return self._initial_deposit_cents / 100
+    
+    def _record_transaction(self, tx_type, amount, symbol=None, quantity=None, price=None):
+        """Append a transaction to the columnar transaction log.
+        
+        Amounts and prices are given in integer cents. Timestamps are stored
+        as raw epoch nanoseconds and left to the caller to format for display.
+        """
+        tx = self._tx
+        tx['type'].append(tx_type)
+        tx['symbol'].append(symbol)
+        tx['quantity'].append(quantity)
+        tx['price'].append(price)
+        tx['amount'].append(amount)
+        tx['timestamp'].append(time.time_ns())
+    
+    def iter_transaction_rows(self, start=0):
+        """Yield transactions as plain tuples, oldest first.
+        
+        Cheaper than ``transactions`` for callers that only read the log, as no
+        per-row dictionary is built.
+        
+        Args:
+            start (int): Index of the first transaction to yield
+            
+        Yields:
+            tuple: (type, symbol, quantity, price, amount, timestamp), with
+            money in dollars and symbol, quantity and price None for deposits
+            and withdrawals
+        """
+        rows = zip(*(self._tx[field][start:] for field in _TX_FIELDS))
+        for tx_type, symbol, quantity, price, amount, timestamp in rows:
+            if price is not None:
+                price /= 100
+            yield tx_type, symbol, quantity, price, amount / 100, timestamp
+    
+    def _iter_transactions(self, start=0):
+        """Yield transaction records from index ``start`` onwards as dictionaries."""
+        for tx_type, symbol, quantity, price, amount, timestamp in self.iter_transaction_rows(start):
+            if symbol is None:
+                yield {'type': tx_type, 'amount': amount, 'timestamp': timestamp}
+            else:
+                yield {
+                    'type': tx_type,
+                    'symbol': symbol,
+                    'quantity': quantity,
+                    'price': price,
+                    'total': amount,
+                    'timestamp': timestamp
+                }
+    
+    @property
+    def transactions(self):
+        """list: All transactions performed by the user, oldest first."""
+        return list(self._iter_transactions())
     
     def deposit_funds(self, amount):
         """Add the specified amount to the user's account balance.
         
         Args:
             amount (float): The amount to deposit
+            
+        Returns:
+            bool: True if successful, False if the amount rounds to zero cents
         """
-        self.balance += amount
+        amount = to_cents(amount)
+        if not amount:
+            return False
+        
+        self._balance_cents += amount
         
         # Record the transaction
-        self.transactions.append({
-            'type': 'deposit',
-            'amount': amount,
-            'timestamp': 'now'  # In a real system, we would use a proper timestamp
-        })
+        self._record_transaction('deposit', amount)
+        
+        return True
     
     def withdraw_funds(self, amount):
         """Attempt to withdraw the specified amount from the user's balance.
@@ -65,19 +201,17 @@ class Account:
             amount (float): The amount to withdraw
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if successful, False if funds are insufficient or the
+            amount rounds to zero cents
         """
-        if amount > self.balance:
+        amount = to_cents(amount)
+        if not amount or amount > self._balance_cents:
             return False
         
-        self.balance -= amount
+        self._balance_cents -= amount
         
         # Record the transaction
-        self.transactions.append({
-            'type': 'withdrawal',
-            'amount': amount,
-            'timestamp': 'now'  # In a real system, we would use a proper timestamp
-        })
+        self._record_transaction('withdrawal', amount)
         
         return True
     
@@ -90,30 +224,26 @@ class Account:
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            TypeError: If quantity is not an integer
         """
-        price = get_share_price(symbol)
+        quantity = operator.index(quantity)
+        price = _price_cents(symbol)
         total_cost = price * quantity
         
-        if total_cost > self.balance:
+        if total_cost > self._balance_cents:
             return False
         
-        self.balance -= total_cost
+        self._balance_cents -= total_cost
         
         # Update holdings
-        if symbol in self.holdings:
-            self.holdings[symbol] += quantity
-        else:
-            self.holdings[symbol] = quantity
+        holdings = self.holdings
+        holdings[symbol] = holdings.get(symbol, 0) + quantity
+        self._holdings_value_cents += total_cost
         
         # Record the transaction
-        self.transactions.append({
-            'type': 'buy',
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': price,
-            'total': total_cost,
-            'timestamp': 'now'  # In a real system, we would use a proper timestamp
-        })
+        self._record_transaction('buy', total_cost, symbol, quantity, price)
         
         return True
     
@@ -126,46 +256,87 @@ class Account:
             
         Returns:
             bool: True if successful, False otherwise
+            
+        Raises:
+            TypeError: If quantity is not an integer
         """
-        if symbol not in self.holdings or self.holdings[symbol] < quantity:
+        quantity = operator.index(quantity)
+        holdings = self.holdings
+        held = holdings.get(symbol)
+        if held is None or held < quantity:
             return False
         
-        price = get_share_price(symbol)
+        price = _price_cents(symbol)
         total_revenue = price * quantity
         
-        self.balance += total_revenue
+        self._balance_cents += total_revenue
         
-        # Update holdings
-        self.holdings[symbol] -= quantity
+        # Update holdings, removing the symbol if no shares are left
+        if held == quantity:
+            del holdings[symbol]
+        else:
+            holdings[symbol] = held - quantity
         
-        # Remove the symbol from holdings if quantity is 0
-        if self.holdings[symbol] == 0:
-            del self.holdings[symbol]
+        if holdings:
+            self._holdings_value_cents -= total_revenue
+        else:
+            self._holdings_value_cents = 0
         
         # Record the transaction
-        self.transactions.append({
-            'type': 'sell',
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': price,
-            'total': total_revenue,
-            'timestamp': 'now'  # In a real system, we would use a proper timestamp
-        })
+        self._record_transaction('sell', total_revenue, symbol, quantity, price)
         
         return True
     
+    def replay(self, events):
+        """Apply a batch of simulated events through the matching account methods.
+        
+        Args:
+            events (iterable): Tuples of ('deposit', amount), ('withdrawal', amount),
+                ('buy', symbol, quantity) or ('sell', symbol, quantity)
+            
+        Returns:
+            int: The number of events applied; events the matching method
+            refuses are skipped
+            
+        Events are applied one at a time, so when one raises, the events
+        before it stay applied.
+        
+        Raises:
+            ValueError: If an event type is unknown, an event is empty, or an
+                amount is not finite
+            TypeError: If an event has the wrong number of fields or a
+                non-integer quantity
+        """
+        handlers = {
+            'deposit': self.deposit_funds,
+            'withdrawal': self.withdraw_funds,
+            'buy': self.buy_shares,
+            'sell': self.sell_shares
+        }
+        applied = 0
+        for kind, *args in events:
+            handler = handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"Unknown event type: {kind}")
+            if handler(*args):
+                applied += 1
+        return applied
+    
     def calculate_portfolio_value(self):
         """Calculate the total value of the user's portfolio.
         
         Returns:
             float: The total value of the portfolio
         """
-        total_value = self.balance
-        
-        for symbol, quantity in self.holdings.items():
-            total_value += get_share_price(symbol) * quantity
-        
-        return total_value
+        return (self._balance_cents + self._get_holdings_value_cents()) / 100
+    
+    def _get_holdings_value_cents(self):
+        """Return the market value of the holdings in cents, revaluing only after a price change."""
+        if self._holdings_value_version != _price_version:
+            self._holdings_value_cents = sum(_price_cents(symbol) * quantity
+                                             for symbol, quantity in self.holdings.items())
+            self._holdings_value_version = _price_version
+        return self._holdings_value_cents
     
     def calculate_profit_or_loss(self):
         """Calculate the user's current profit or loss since the initial deposit.
@@ -173,7 +344,8 @@ class Account:
         Returns:
             float: The profit or loss
         """
-        return self.calculate_portfolio_value() - self.initial_deposit
+        return (self._balance_cents + self._get_holdings_value_cents()
+                - self._initial_deposit_cents) / 100
     
     def get_holdings(self):
         """Return a dictionary of current stock holdings with quantities.
@@ -183,13 +355,43 @@ class Account:
         """
         return self.holdings.copy()
     
+    def get_holdings_view(self):
+        """Return a read-only, live view of the current stock holdings.
+        
+        Cheaper than ``get_holdings`` for callers that only read the holdings.
+        
+        Returns:
+            mappingproxy: A read-only mapping of stock symbols to quantities
+        """
+        return MappingProxyType(self.holdings)
+    
     def get_transactions(self):
         """Return a list of all transactions performed by the user.
         
         Returns:
             list: A list of all transactions
         """
-        return self.transactions.copy()
+        return self.transactions
+    
+    def get_transaction_count(self):
+        """Return the number of transactions performed by the user.
+        
+        Returns:
+            int: The number of transactions
+        """
+        return len(self._tx['type'])
+    
+    def snapshot(self):
+        """Compute all valuation figures for the account in a single pass.
+        
+        Returns:
+            tuple: (balance, holdings_value, portfolio_value, profit_or_loss)
+        """
+        balance = self._balance_cents
+        holdings_value = self._get_holdings_value_cents()
+        portfolio_value = balance + holdings_value
+        return (balance / 100, holdings_value / 100, portfolio_value / 100,
+                (portfolio_value - self._initial_deposit_cents) / 100)
     
     def get_report(self):
         """Return a comprehensive report of the user's account.
@@ -197,10 +399,11 @@ class Account:
         Returns:
             dict: A dictionary containing account information
         """
+        balance, _, portfolio_value, profit_or_loss = self.snapshot()
         return {
             'user_id': self.user_id,
-            'balance': self.balance,
+            'balance': balance,
             'holdings': self.get_holdings(),
-            'portfolio_value': self.calculate_portfolio_value(),
-            'profit_or_loss': self.calculate_profit_or_loss()
+            'portfolio_value': portfolio_value,
+            'profit_or_loss': profit_or_loss
         }
\ No newline at end of file
@@ -1,109 +1,191 @@
+from collections import deque
+
 import gradio as gr
-from accounts import Account, get_share_price
+from accounts import SUPPORTED_SYMBOLS, Account, get_price_version, get_share_price, to_cents
 
 # Initialize a single account
 account = None
 
-def create_account(user_id, initial_deposit):
-    global account
-    if not user_id:
-        return "Error: User ID is required.", None
+# Fixed outputs for the no-account and empty states, shared by every handler
+_NO_ACCOUNT = "No account exists. Please create an account first."
+_NO_ACCOUNT_ERROR = "Error: " + _NO_ACCOUNT
+_NO_HOLDINGS = "No holdings found."
+_NO_TRANSACTIONS = "No transactions found."
+
+# Result of any account-changing handler called before an account exists; the
+# update carries no value, so Gradio leaves it intact and it can be shared
+_NO_ACCOUNT_RESULT = (_NO_ACCOUNT_ERROR, gr.update())
+
+# Most transaction history lines shown; the account itself keeps the full log
+MAX_DISPLAYED_TRANSACTIONS = 1000
+
+# Formatted transaction history lines; only transactions added since the last
+# refresh are formatted and appended, and the oldest lines fall off the end
+_tx_lines = deque(maxlen=MAX_DISPLAYED_TRANSACTIONS)
+_tx_formatted = 0
+
+# Holdings section of the account summary and the price version it was
+# formatted at; new accounts, buys, sells and price refreshes change it, so it
+# is rebuilt lazily after one of those
+_holdings_text = None
+_holdings_version = None
+
+# Figures the account summary header was last formatted from, and the result
+_summary_key = None
+_summary_header = ""
+
+# Row templates, bound once so each row costs a single format call
+_HOLDING_LINE = "{}: {} shares at ${:.2f} each = ${:.2f}\n".format
+# Transaction templates take (number, symbol, quantity, price, amount)
+_TX_LINES = {
+    'deposit': "{0}. Deposit: ${4:.2f}\n".format,
+    'withdrawal': "{0}. Withdrawal: ${4:.2f}\n".format,
+    'buy': "{0}. Buy: {2} shares of {1} at ${3:.2f} = ${4:.2f}\n".format,
+    'sell': "{0}. Sell: {2} shares of {1} at ${3:.2f} = ${4:.2f}\n".format,
+}
+
+def _format_holdings(holdings):
+    """Render one line per holding, joined once rather than concatenated per row."""
+    lines = []
+    for symbol, quantity in holdings.items():
+        price = get_share_price(symbol)
+        lines.append(_HOLDING_LINE(symbol, quantity, price, price * quantity))
+    return "".join(lines)
+
+def _format_transaction(i, tx_type, symbol, quantity, price, amount):
+    """Render a single numbered transaction history line."""
+    line = _TX_LINES.get(tx_type)
+    return line(i, symbol, quantity, price, amount) if line else ""
+
+def _parse_amount(value, label):
+    """Parse a dollar amount typed into the UI.
+    
+    Args:
+        value: The raw input
+        label (str): How the amount is named in error messages
+        
+    Returns:
+        int: The amount in cents, exactly as the account will record it
+        
+    Raises:
+        ValueError: With the message to show if the amount is unusable
+    """
+    try:
+        amount = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} must be a number.") from None
     
     try:
-        initial_deposit = float(initial_deposit)
+        cents = to_cents(amount)
     except ValueError:
-        return "Error: Initial deposit must be a number.", None
+        raise ValueError(f"{label} must be a finite number.") from None
+    
+    if not amount > 0:
+        raise ValueError(f"{label} must be positive.")
     
-    if initial_deposit <= 0:
-        return "Error: Initial deposit must be positive.", None
+    if not cents:
+        raise ValueError(f"{label} must be at least $0.01.")
     
-    account = Account(user_id, initial_deposit)
-    return f"Account created for {user_id} with initial deposit of ${initial_deposit:.2f}", get_account_info()
+    return cents
+
+def create_account(user_id, initial_deposit):
+    global account, _holdings_text, _tx_formatted
+    if not user_id:
+        return "Error: User ID is required.", gr.update()
+    
+    try:
+        cents = _parse_amount(initial_deposit, "Initial deposit")
+    except ValueError as e:
+        return f"Error: {e}", gr.update()
+    
+    account = Account(user_id, cents / 100)
+    _tx_lines.clear()
+    _tx_formatted = 0
+    _holdings_text = None
+    return f"Account created for {user_id} with initial deposit of ${cents / 100:.2f}", get_account_info()
 
 def deposit(amount):
     if account is None:
-        return "Error: No account exists. Please create an account first.", None
+        return _NO_ACCOUNT_RESULT
     
     try:
-        amount = float(amount)
-    except ValueError:
-        return "Error: Amount must be a number.", None
-    
-    if amount <= 0:
-        return "Error: Deposit amount must be positive.", None
+        cents = _parse_amount(amount, "Deposit amount")
+    except ValueError as e:
+        return f"Error: {e}", gr.update()
     
-    account.deposit_funds(amount)
-    return f"Successfully deposited ${amount:.2f}", get_account_info()
+    account.deposit_funds(cents / 100)
+    return f"Successfully deposited ${cents / 100:.2f}", get_account_info()
 
 def withdraw(amount):
     if account is None:
-        return "Error: No account exists. Please create an account first.", None
+        return _NO_ACCOUNT_RESULT
     
     try:
-        amount = float(amount)
-    except ValueError:
-        return "Error: Amount must be a number.", None
+        cents = _parse_amount(amount, "Withdrawal amount")
+    except ValueError as e:
+        return f"Error: {e}", gr.update()
     
-    if amount <= 0:
-        return "Error: Withdrawal amount must be positive.", None
-    
-    if account.withdraw_funds(amount):
-        return f"Successfully withdrew ${amount:.2f}", get_account_info()
+    if account.withdraw_funds(cents / 100):
+        return f"Successfully withdrew ${cents / 100:.2f}", get_account_info()
     else:
-        return "Error: Insufficient funds for withdrawal.", None
+        return "Error: Insufficient funds for withdrawal.", gr.update()
 
 def buy_shares(symbol, quantity):
+    global _holdings_text
     if account is None:
-        return "Error: No account exists. Please create an account first.", None
+        return _NO_ACCOUNT_RESULT
     
     try:
         quantity = int(quantity)
-    except ValueError:
-        return "Error: Quantity must be an integer.", None
+    except (TypeError, ValueError):
+        return "Error: Quantity must be an integer.", gr.update()
     
     if quantity <= 0:
-        return "Error: Quantity must be positive.", None
+        return "Error: Quantity must be positive.", gr.update()
     
     symbol = symbol.upper()
     price = get_share_price(symbol)
     
     if price == 0.0:
-        return f"Error: Symbol {symbol} not found.", None
+        return f"Error: Symbol {symbol} not found.", gr.update()
     
     if account.buy_shares(symbol, quantity):
+        _holdings_text = None
         return f"Successfully bought {quantity} shares of {symbol} at ${price:.2f} each.", get_account_info()
     else:
-        return "Error: Insufficient funds to buy shares.", None
+        return "Error: Insufficient funds to buy shares.", gr.update()
 
 def sell_shares(symbol, quantity):
+    global _holdings_text
     if account is None:
-        return "Error: No account exists. Please create an account first.", None
+        return _NO_ACCOUNT_RESULT
     
     try:
         quantity = int(quantity)
-    except ValueError:
-        return "Error: Quantity must be an integer.", None
+    except (TypeError, ValueError):
+        return "Error: Quantity must be an integer.", gr.update()
     
     if quantity <= 0:
-        return "Error: Quantity must be positive.", None
+        return "Error: Quantity must be positive.", gr.update()
     
     symbol = symbol.upper()
     
     if account.sell_shares(symbol, quantity):
+        _holdings_text = None
         return f"Successfully sold {quantity} shares of {symbol}.", get_account_info()
     else:
-        return "Error: Insufficient shares to sell.", None
+        return "Error: Insufficient shares to sell.", gr.update()
 
 def get_portfolio_value():
     if account is None:
-        return "Error: No account exists. Please create an account first."
+        return _NO_ACCOUNT_ERROR
     
     value = account.calculate_portfolio_value()
     return f"Total portfolio value: ${value:.2f}"
 
 def get_profit_loss():
     if account is None:
-        return "Error: No account exists. Please create an account first."
+        return _NO_ACCOUNT_ERROR
     
     pnl = account.calculate_profit_or_loss()
     if pnl >= 0:
@@ -113,67 +195,59 @@ def get_profit_loss():
 
 def get_holdings():
     if account is None:
-        return "Error: No account exists. Please create an account first."
+        return _NO_ACCOUNT_ERROR
     
-    holdings = account.get_holdings()
+    holdings = account.get_holdings_view()
     if not holdings:
-        return "No holdings found."
+        return _NO_HOLDINGS
     
-    result = "Current Holdings:\n"
-    for symbol, quantity in holdings.items():
-        price = get_share_price(symbol)
-        value = price * quantity
-        result += f"{symbol}: {quantity} shares at ${price:.2f} each = ${value:.2f}\n"
-    
-    return result
+    return "Current Holdings:\n" + _format_holdings(holdings)
 
 def get_transactions():
+    global _tx_formatted
     if account is None:
-        return "Error: No account exists. Please create an account first."
-    
-    transactions = account.get_transactions()
-    if not transactions:
-        return "No transactions found."
-    
-    result = "Transaction History:\n"
-    for i, tx in enumerate(transactions, 1):
-        if tx['type'] == 'deposit':
-            result += f"{i}. Deposit: ${tx['amount']:.2f}\n"
-        elif tx['type'] == 'withdrawal':
-            result += f"{i}. Withdrawal: ${tx['amount']:.2f}\n"
-        elif tx['type'] == 'buy':
-            result += f"{i}. Buy: {tx['quantity']} shares of {tx['symbol']} at ${tx['price']:.2f} = ${tx['total']:.2f}\n"
-        elif tx['type'] == 'sell':
-            result += f"{i}. Sell: {tx['quantity']} shares of {tx['symbol']} at ${tx['price']:.2f} = ${tx['total']:.2f}\n"
-    
-    return result
-
-def get_account_info():
-    if account is None:
-        return "No account exists. Please create an account first."
-    
-    report = account.get_report()
+        return _NO_ACCOUNT_ERROR
     
-    result = f"User ID: {report['user_id']}\n"
-    result += f"Cash Balance: ${report['balance']:.2f}\n"
-    result += f"Portfolio Value: ${report['portfolio_value']:.2f}\n"
-    
-    pnl = report['profit_or_loss']
-    if pnl >= 0:
-        result += f"Profit: ${pnl:.2f}\n"
-    else:
-        result += f"Loss: ${-pnl:.2f}\n"
+    # Skip rows that would fall straight off the end of the displayed lines
+    total = account.get_transaction_count()
+    start = max(_tx_formatted, total - MAX_DISPLAYED_TRANSACTIONS)
+    rows = account.iter_transaction_rows(start)
+    for i, (tx_type, symbol, quantity, price, amount, _) in enumerate(rows, start + 1):
+        _tx_lines.append(_format_transaction(i, tx_type, symbol, quantity, price, amount))
+    _tx_formatted = total
     
-    result += "\nHoldings:\n"
-    if not report['holdings']:
-        result += "No holdings\n"
-    else:
-        for symbol, quantity in report['holdings'].items():
-            price = get_share_price(symbol)
-            value = price * quantity
-            result += f"{symbol}: {quantity} shares at ${price:.2f} each = ${value:.2f}\n"
+    if not _tx_lines:
+        return _NO_TRANSACTIONS
     
-    return result
+    return "Transaction History:\n" + "".join(_tx_lines)
+
+def get_account_info():
+    global _holdings_text, _holdings_version, _summary_key, _summary_header
+    if account is None:
+        return _NO_ACCOUNT
+    
+    balance, _, portfolio_value, pnl = account.snapshot()
+    key = (account, balance, portfolio_value, pnl)
+    if key != _summary_key:
+        result = f"User ID: {account.user_id}\n"
+        result += f"Cash Balance: ${balance:.2f}\n"
+        result += f"Portfolio Value: ${portfolio_value:.2f}\n"
+        
+        if pnl >= 0:
+            result += f"Profit: ${pnl:.2f}\n"
+        else:
+            result += f"Loss: ${-pnl:.2f}\n"
+        
+        _summary_key = key
+        _summary_header = result
+    
+    price_version = get_price_version()
+    if _holdings_text is None or _holdings_version != price_version:
+        holdings = account.get_holdings_view()
+        _holdings_text = _format_holdings(holdings) if holdings else "No holdings\n"
+        _holdings_version = price_version
+    
+    return _summary_header + "\nHoldings:\n" + _holdings_text
 
 with gr.Blocks(title="Trading Simulation Platform") as demo:
     gr.Markdown("# Trading Simulation Platform")
@@ -199,7 +273,7 @@ with gr.Blocks(title="Trading Simulation Platform") as demo:
         with gr.Group():
             gr.Markdown("### Buy Shares")
             with gr.Row():
-                buy_symbol_input = gr.Textbox(label="Symbol (AAPL, TSLA, GOOGL)")
+                buy_symbol_input = gr.Textbox(label=f"Symbol ({', '.join(SUPPORTED_SYMBOLS)})")
                 buy_quantity_input = gr.Textbox(label="Quantity")
             buy_btn = gr.Button("Buy Shares")
             
@@ -0,0 +1,15 @@
+import pytest
+
+import accounts
+
+@pytest.fixture(scope="session")
+def _baseline_prices():
+    return dict(accounts._PRICES)
+
+@pytest.fixture
+def prices(_baseline_prices):
+    """Yield the mock price table for editing; the baseline prices are restored afterwards."""
+    yield accounts._PRICES
+    accounts._PRICES.clear()
+    accounts._PRICES.update(_baseline_prices)
+    accounts.refresh_prices()
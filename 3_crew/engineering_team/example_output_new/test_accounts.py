@@ -1,111 +1,319 @@
-import unittest
+"""Tests for accounts.py.
+
+Every test works on its own copy of the session-built account and restores any
+price it changes, so the suite can be spread across processes with
+pytest-xdist: ``pytest -n auto test_accounts.py``.
+"""
+import copy
+
+import pytest
+
+import accounts
 from accounts import get_share_price, Account
 
-class TestGetSharePrice(unittest.TestCase):
-    def test_valid_symbols(self):
-        self.assertEqual(get_share_price('AAPL'), 150.0)
-        self.assertEqual(get_share_price('TSLA'), 800.0)
-        self.assertEqual(get_share_price('GOOGL'), 2500.0)
-    
-    def test_invalid_symbol(self):
-        self.assertEqual(get_share_price('INVALID'), 0.0)
+MOCK_TIMESTAMP = 1_700_000_000_000_000_000
 
-class TestAccount(unittest.TestCase):
-    def setUp(self):
-        self.account = Account('test_user', 10000.0)
-    
-    def test_initialization(self):
-        self.assertEqual(self.account.user_id, 'test_user')
-        self.assertEqual(self.account.balance, 10000.0)
-        self.assertEqual(self.account.initial_deposit, 10000.0)
-        self.assertEqual(self.account.holdings, {})
-        self.assertEqual(len(self.account.transactions), 1)
-        self.assertEqual(self.account.transactions[0]['type'], 'deposit')
-    
-    def test_deposit_funds(self):
-        self.account.deposit_funds(500.0)
-        self.assertEqual(self.account.balance, 10500.0)
-        self.assertEqual(len(self.account.transactions), 2)
-        self.assertEqual(self.account.transactions[1]['type'], 'deposit')
-    
-    def test_withdraw_funds_success(self):
-        result = self.account.withdraw_funds(1000.0)
-        self.assertTrue(result)
-        self.assertEqual(self.account.balance, 9000.0)
-        self.assertEqual(len(self.account.transactions), 2)
-        self.assertEqual(self.account.transactions[1]['type'], 'withdrawal')
-    
-    def test_withdraw_funds_failure(self):
-        result = self.account.withdraw_funds(20000.0)
-        self.assertFalse(result)
-        self.assertEqual(self.account.balance, 10000.0)
-        self.assertEqual(len(self.account.transactions), 1)
-    
-    def test_buy_shares_success(self):
-        result = self.account.buy_shares('AAPL', 10)
-        self.assertTrue(result)
-        self.assertEqual(self.account.balance, 10000.0 - (150.0 * 10))
-        self.assertEqual(self.account.holdings, {'AAPL': 10})
-        self.assertEqual(len(self.account.transactions), 2)
-        self.assertEqual(self.account.transactions[1]['type'], 'buy')
-    
-    def test_buy_shares_failure(self):
-        result = self.account.buy_shares('AAPL', 1000)
-        self.assertFalse(result)
-        self.assertEqual(self.account.balance, 10000.0)
-        self.assertEqual(self.account.holdings, {})
-        self.assertEqual(len(self.account.transactions), 1)
-    
-    def test_sell_shares_success(self):
-        self.account.buy_shares('AAPL', 10)
-        result = self.account.sell_shares('AAPL', 5)
-        self.assertTrue(result)
-        self.assertEqual(self.account.balance, 10000.0 - (150.0 * 10) + (150.0 * 5))
-        self.assertEqual(self.account.holdings, {'AAPL': 5})
-        self.assertEqual(len(self.account.transactions), 3)
-    
-    def test_sell_shares_failure(self):
-        result = self.account.sell_shares('AAPL', 5)
-        self.assertFalse(result)
-        self.assertEqual(self.account.balance, 10000.0)
-        self.assertEqual(self.account.holdings, {})
-        self.assertEqual(len(self.account.transactions), 1)
-    
-    def test_calculate_portfolio_value(self):
-        self.account.buy_shares('AAPL', 10)
-        self.account.buy_shares('TSLA', 5)
-        expected_value = (10000.0 - (150.0 * 10) - (800.0 * 5)) + (150.0 * 10) + (800.0 * 5)
-        self.assertEqual(self.account.calculate_portfolio_value(), expected_value)
-    
-    def test_calculate_profit_or_loss(self):
-        self.account.buy_shares('AAPL', 10)
-        portfolio_value = self.account.calculate_portfolio_value()
-        expected_profit_loss = portfolio_value - 10000.0
-        self.assertEqual(self.account.calculate_profit_or_loss(), expected_profit_loss)
+def _frozen_time_ns():
+    return MOCK_TIMESTAMP
+
+def _tx(type, amount=None, symbol=None, quantity=None, price=None, total=None, ts=MOCK_TIMESTAMP):
+    """Build the expected record for a deposit/withdrawal (amount) or a share trade."""
+    if symbol is None:
+        return {'type': type, 'amount': amount, 'timestamp': ts}
+    return {'type': type, 'symbol': symbol, 'quantity': quantity, 'price': price, 'total': total, 'timestamp': ts}
+
+# Record every fixture-built account starts with
+INITIAL_DEPOSIT_TX = _tx('deposit', amount=10000.0)
+
+@pytest.fixture(autouse=True)
+def _freeze_time(monkeypatch):
+    """Pin transaction timestamps to MOCK_TIMESTAMP for every test.
     
-    def test_get_holdings(self):
-        self.account.buy_shares('AAPL', 10)
-        holdings = self.account.get_holdings()
-        self.assertEqual(holdings, {'AAPL': 10})
-        # Test that it's a copy
+    accounts.py must look up ``time.time_ns`` at call time (not bind it at
+    import) for this patch to take effect.
+    """
+    monkeypatch.setattr(accounts.time, 'time_ns', _frozen_time_ns)
+
+@pytest.fixture(scope="session")
+def _template_account():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(accounts.time, 'time_ns', _frozen_time_ns)
+        return Account('test_user', 10000.0)
+
+@pytest.fixture
+def account(_template_account):
+    return copy.deepcopy(_template_account)
+
+@pytest.fixture
+def account_with_aapl(account):
+    account.buy_shares('AAPL', 10)
+    return account
+
+@pytest.fixture
+def account_factory(_template_account):
+    def _make(buys=(), withdraws=()):
+        account = copy.deepcopy(_template_account)
+        for symbol, quantity in buys:
+            account.buy_shares(symbol, quantity)
+        for amount in withdraws:
+            account.withdraw_funds(amount)
+        return account
+    return _make
+
+@pytest.mark.parametrize("symbol,expected", [
+    ('AAPL', 150.0),
+    ('TSLA', 800.0),
+    ('GOOGL', 2500.0),
+    ('INVALID', 0.0),
+    ('aapl', 0.0),
+])
+def test_get_share_price(symbol, expected):
+    assert get_share_price(symbol) == expected
+
+def test_refresh_prices(prices):
+    assert get_share_price('AAPL') == 150.0
+    prices['AAPL'] = 175.0
+    assert get_share_price('AAPL') == 150.0
+    version = accounts.get_price_version()
+    accounts.refresh_prices()
+    assert get_share_price('AAPL') == 175.0
+    assert accounts.get_price_version() != version
+
+def test_initialization(account):
+    assert account.user_id == 'test_user'
+    assert account.balance == 10000.0
+    assert account.initial_deposit == 10000.0
+    assert account.holdings == {}
+    assert account.transactions == [INITIAL_DEPOSIT_TX]
+
+def test_deposit_funds(account):
+    assert account.deposit_funds(500.0)
+    assert account.balance == 10500.0
+    transactions = account.transactions
+    assert len(transactions) == 2
+    assert transactions[1] == _tx('deposit', amount=500.0)
+
+def test_deposit_funds_exact_cents():
+    account = Account('test_user', 0.1)
+    account.deposit_funds(0.2)
+    assert account.balance == 0.3
+    assert account.calculate_profit_or_loss() == 0.2
+
+def test_repeated_fractional_amounts_are_exact(account, prices):
+    for _ in range(10):
+        account.deposit_funds(0.1)
+    prices['TSLA'] = 700.5
+    accounts.refresh_prices()
+    account.buy_shares('TSLA', 3)
+    assert account.balance == 10001.0 - 2101.5
+    assert account.calculate_profit_or_loss() == 1.0
+
+@pytest.mark.parametrize("amount", [float('inf'), float('-inf'), float('nan'), 1e307])
+def test_non_finite_amounts_rejected(account, amount):
+    with pytest.raises(ValueError, match="Amount must be finite"):
+        Account('test_user', amount)
+    with pytest.raises(ValueError, match="Amount must be finite"):
+        account.deposit_funds(amount)
+    with pytest.raises(ValueError, match="Amount must be finite"):
+        account.withdraw_funds(amount)
+    assert account.balance == 10000.0
+    assert account.transactions == [INITIAL_DEPOSIT_TX]
+
+@pytest.mark.parametrize("amount", [0.001, 0.005])
+def test_sub_cent_amounts_refused(account, amount):
+    assert not account.deposit_funds(amount)
+    assert not account.withdraw_funds(amount)
+    assert account.balance == 10000.0
+    assert account.transactions == [INITIAL_DEPOSIT_TX]
+
+def test_withdraw_funds_success(account):
+    result = account.withdraw_funds(1000.0)
+    assert result
+    assert account.balance == 9000.0
+    transactions = account.transactions
+    assert len(transactions) == 2
+    assert transactions[1] == _tx('withdrawal', amount=1000.0)
+
+def test_withdraw_funds_failure(account):
+    result = account.withdraw_funds(20000.0)
+    assert not result
+    assert account.balance == 10000.0
+    assert account.transactions == [INITIAL_DEPOSIT_TX]
+
+@pytest.mark.parametrize("symbol,quantity,cost", [
+    ('AAPL', 10, 1500.0),
+    ('TSLA', 5, 4000.0),
+    ('GOOGL', 4, 10000.0),
+])
+def test_buy_shares_success(account, symbol, quantity, cost):
+    result = account.buy_shares(symbol, quantity)
+    assert result
+    assert account.balance == 10000.0 - cost
+    assert account.holdings == {symbol: quantity}
+    transactions = account.transactions
+    assert len(transactions) == 2
+    assert transactions[1] == _tx('buy', symbol=symbol, quantity=quantity,
+                                  price=cost / quantity, total=cost)
+
+@pytest.mark.parametrize("symbol,quantity", [
+    ('AAPL', 1000),
+    ('TSLA', 13),
+    ('GOOGL', 5),
+])
+def test_buy_shares_failure(account, symbol, quantity):
+    result = account.buy_shares(symbol, quantity)
+    assert not result
+    assert account.balance == 10000.0
+    assert account.holdings == {}
+    assert account.transactions == [INITIAL_DEPOSIT_TX]
+
+@pytest.mark.parametrize("quantity", [2.5, 2.0, '2'])
+def test_trades_require_integer_quantity(account_with_aapl, quantity):
+    with pytest.raises(TypeError):
+        account_with_aapl.buy_shares('AAPL', quantity)
+    with pytest.raises(TypeError):
+        account_with_aapl.sell_shares('AAPL', quantity)
+    assert account_with_aapl.balance == 8500.0
+    assert account_with_aapl.holdings == {'AAPL': 10}
+    assert len(account_with_aapl.transactions) == 2
+
+def test_sell_shares_success(account):
+    account.buy_shares('AAPL', 10)
+    result = account.sell_shares('AAPL', 5)
+    assert result
+    assert account.balance == 10000.0 - (150.0 * 10) + (150.0 * 5)
+    assert account.holdings == {'AAPL': 5}
+    transactions = account.transactions
+    assert len(transactions) == 3
+    assert transactions[2] == _tx('sell', symbol='AAPL', quantity=5, price=150.0, total=750.0)
+
+@pytest.mark.parametrize("buys,quantity,balance,holdings,tx_count", [
+    ((), 5, 10000.0, {}, 1),
+    ((('AAPL', 10),), 11, 8500.0, {'AAPL': 10}, 2),
+])
+def test_sell_shares_failure(account_factory, buys, quantity, balance, holdings, tx_count):
+    account = account_factory(buys)
+    result = account.sell_shares('AAPL', quantity)
+    assert not result
+    assert account.balance == balance
+    assert account.holdings == holdings
+    transactions = account.transactions
+    assert transactions[0] == INITIAL_DEPOSIT_TX
+    assert len(transactions) == tx_count
+
+def test_replay(account):
+    applied = account.replay([
+        ('deposit', 500.0),
+        ('buy', 'AAPL', 10),
+        ('buy', 'GOOGL', 4),
+        ('sell', 'AAPL', 4),
+        ('withdrawal', 20000.0),
+        ('sell', 'TSLA', 1),
+    ])
+    assert applied == 3
+    assert account.balance == 10500.0 - (150.0 * 10) + (150.0 * 4)
+    assert account.holdings == {'AAPL': 6}
+    assert account.calculate_portfolio_value() == 10500.0
+    assert account.transactions == [
+        INITIAL_DEPOSIT_TX,
+        _tx('deposit', amount=500.0),
+        _tx('buy', symbol='AAPL', quantity=10, price=150.0, total=1500.0),
+        _tx('sell', symbol='AAPL', quantity=4, price=150.0, total=600.0),
+    ]
+
+def test_replay_matches_method_calls(account_factory):
+    events = [('buy', 'TSLA', 5), ('deposit', 0.001), ('sell', 'TSLA', 5), ('withdrawal', 250.5)]
+    replayed = account_factory()
+    replayed.replay(events)
+    called = account_factory()
+    called.buy_shares('TSLA', 5)
+    called.deposit_funds(0.001)
+    called.sell_shares('TSLA', 5)
+    called.withdraw_funds(250.5)
+    assert replayed.transactions == called.transactions
+    assert replayed.snapshot() == called.snapshot()
+
+def test_replay_unknown_event(account):
+    with pytest.raises(ValueError, match="Unknown event type: transfer"):
+        account.replay([('deposit', 100.0), ('transfer', 5.0)])
+    assert account.balance == 10100.0
+
+@pytest.mark.parametrize("event,error", [
+    (('buy', 'AAPL'), TypeError),
+    (('sell', 'AAPL', 1.5), TypeError),
+    (('deposit', float('inf')), ValueError),
+    ((), ValueError),
+])
+def test_replay_malformed_event(account, event, error):
+    with pytest.raises(error):
+        account.replay([('deposit', 100.0), event, ('deposit', 100.0)])
+    assert account.balance == 10100.0
+    assert len(account.transactions) == 2
+
+def test_calculate_portfolio_value(account):
+    account.buy_shares('AAPL', 10)
+    account.buy_shares('TSLA', 5)
+    expected_value = (10000.0 - (150.0 * 10) - (800.0 * 5)) + (150.0 * 10) + (800.0 * 5)
+    assert account.calculate_portfolio_value() == expected_value
+
+def test_portfolio_value_after_price_change(account, prices):
+    account.buy_shares('AAPL', 10)
+    prices['AAPL'] = 200.0
+    accounts.refresh_prices()
+    assert account.calculate_portfolio_value() == 8500.0 + 2000.0
+
+@pytest.mark.parametrize("buys,withdraws,new_prices,expected", [
+    ((), (), {}, 0.0),
+    ((('AAPL', 10),), (), {}, 0.0),
+    ((('AAPL', 10),), (1000.0,), {}, -1000.0),
+    ((('AAPL', 10),), (), {'AAPL': 200.0}, 500.0),
+    ((('AAPL', 10), ('TSLA', 2)), (500.0,), {'AAPL': 140.0, 'TSLA': 850.5}, -500.0 - 100.0 + 101.0),
+])
+def test_calculate_profit_or_loss(account_factory, prices, buys, withdraws, new_prices, expected):
+    account = account_factory(buys, withdraws)
+    if new_prices:
+        prices.update(new_prices)
+        accounts.refresh_prices()
+    assert account.calculate_profit_or_loss() == expected
+
+def test_get_holdings(account_with_aapl):
+    assert account_with_aapl.get_holdings() == {'AAPL': 10}
+
+def test_get_holdings_returns_copy(account_with_aapl):
+    holdings = account_with_aapl.get_holdings()
+    holdings['AAPL'] = 5
+    assert account_with_aapl.holdings == {'AAPL': 10}
+
+def test_get_holdings_view(account):
+    holdings = account.get_holdings_view()
+    account.buy_shares('AAPL', 10)
+    assert holdings == {'AAPL': 10}
+    with pytest.raises(TypeError):
         holdings['AAPL'] = 5
-        self.assertEqual(self.account.holdings, {'AAPL': 10})
-    
-    def test_get_transactions(self):
-        self.account.deposit_funds(500.0)
-        transactions = self.account.get_transactions()
-        self.assertEqual(len(transactions), 2)
-        # Test that it's a copy
-        transactions.append({'test': 'data'})
-        self.assertEqual(len(self.account.transactions), 2)
-    
-    def test_get_report(self):
-        report = self.account.get_report()
-        self.assertEqual(report['user_id'], 'test_user')
-        self.assertEqual(report['balance'], 10000.0)
-        self.assertEqual(report['holdings'], {})
-        self.assertEqual(report['portfolio_value'], 10000.0)
-        self.assertEqual(report['profit_or_loss'], 0.0)
+
+def test_get_transactions(account_with_aapl):
+    assert len(account_with_aapl.get_transactions()) == 2
+
+def test_iter_transaction_rows(account_with_aapl):
+    assert list(account_with_aapl.iter_transaction_rows(1)) == [
+        ('buy', 'AAPL', 10, 150.0, 1500.0, MOCK_TIMESTAMP),
+    ]
+
+def test_get_transactions_returns_copy(account_with_aapl):
+    transactions = account_with_aapl.get_transactions()
+    transactions.append({'test': 'data'})
+    assert len(account_with_aapl.transactions) == 2
+
+def test_snapshot(account_with_aapl):
+    assert account_with_aapl.snapshot() == (8500.0, 1500.0, 10000.0, 0.0)
+
+def test_get_report(account):
+    report = account.get_report()
+    assert report['user_id'] == 'test_user'
+    assert report['balance'] == 10000.0
+    assert report['holdings'] == {}
+    assert report['portfolio_value'] == 10000.0
+    assert report['profit_or_loss'] == 0.0
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__]))
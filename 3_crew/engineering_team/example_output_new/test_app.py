@@ -0,0 +1,131 @@
+"""Tests for the Gradio handlers in app.py, called directly without a UI."""
+import pytest
+
+import accounts
+import app
+
+@pytest.fixture(autouse=True)
+def _reset_app(monkeypatch):
+    """Start every test with no account and empty display caches."""
+    monkeypatch.setattr(app, 'account', None)
+    monkeypatch.setattr(app, '_tx_lines', app.deque(maxlen=app.MAX_DISPLAYED_TRANSACTIONS))
+    monkeypatch.setattr(app, '_tx_formatted', 0)
+    monkeypatch.setattr(app, '_holdings_text', None)
+    monkeypatch.setattr(app, '_holdings_version', None)
+    monkeypatch.setattr(app, '_summary_key', None)
+    monkeypatch.setattr(app, '_summary_header', "")
+
+@pytest.fixture
+def funded():
+    app.create_account('test_user', '10000')
+
+@pytest.mark.parametrize("amount", ['inf', '-inf', 'nan', '1e400', '1e307'])
+def test_create_account_rejects_non_finite(amount):
+    message, _ = app.create_account('test_user', amount)
+    assert message == "Error: Initial deposit must be a finite number."
+    assert app.account is None
+
+def test_create_account_rejects_sub_cent():
+    message, _ = app.create_account('test_user', '0.001')
+    assert message == "Error: Initial deposit must be at least $0.01."
+    assert app.account is None
+
+@pytest.mark.parametrize("handler,label", [
+    (app.deposit, "Deposit"),
+    (app.withdraw, "Withdrawal"),
+])
+@pytest.mark.parametrize("amount", ['inf', '-inf', 'nan', '1e400', '1e307'])
+def test_amount_handlers_reject_non_finite(funded, handler, label, amount):
+    message, _ = handler(amount)
+    assert message == f"Error: {label} amount must be a finite number."
+    assert len(app.account.transactions) == 1
+
+def test_create_account_reports_recorded_amount():
+    message, _ = app.create_account('test_user', '0.125')
+    assert message == "Account created for test_user with initial deposit of $0.12"
+    assert app.account.balance == 0.12
+
+def test_deposit_reports_recorded_amount(funded):
+    message, _ = app.deposit('0.025')
+    assert message == "Successfully deposited $0.02"
+    assert app.account.transactions[-1]['amount'] == 0.02
+
+def test_withdraw_reports_recorded_amount(funded):
+    message, _ = app.withdraw('0.025')
+    assert message == "Successfully withdrew $0.02"
+    assert app.account.transactions[-1]['amount'] == 0.02
+
+@pytest.mark.parametrize("handler,label", [
+    (app.deposit, "Deposit"),
+    (app.withdraw, "Withdrawal"),
+])
+def test_amount_handlers_reject_sub_cent(funded, handler, label):
+    message, _ = handler('0.001')
+    assert message == f"Error: {label} amount must be at least $0.01."
+    assert app.account.balance == 10000.0
+    assert len(app.account.transactions) == 1
+
+def test_transaction_history_formats_new_rows_only(funded):
+    assert app.get_transactions() == "Transaction History:\n1. Deposit: $10000.00\n"
+    app.deposit('50')
+    app.buy_shares('aapl', '2')
+    assert app.get_transactions() == (
+        "Transaction History:\n"
+        "1. Deposit: $10000.00\n"
+        "2. Deposit: $50.00\n"
+        "3. Buy: 2 shares of AAPL at $150.00 = $300.00\n"
+    )
+    assert app._tx_formatted == 3
+
+def test_transaction_history_reset_on_new_account(funded):
+    app.deposit('50')
+    app.get_transactions()
+    app.create_account('other_user', '20')
+    assert app.get_transactions() == "Transaction History:\n1. Deposit: $20.00\n"
+
+def test_transaction_history_keeps_latest_lines(funded, monkeypatch):
+    monkeypatch.setattr(app, 'MAX_DISPLAYED_TRANSACTIONS', 2)
+    monkeypatch.setattr(app, '_tx_lines', app.deque(maxlen=2))
+    app.deposit('1')
+    app.deposit('2')
+    assert app.get_transactions() == "Transaction History:\n2. Deposit: $1.00\n3. Deposit: $2.00\n"
+
+def test_transaction_history_formats_displayed_rows_only(funded, monkeypatch):
+    app.account.replay([('deposit', 1.0)] * (app.MAX_DISPLAYED_TRANSACTIONS + 500))
+    formatted = []
+    format_transaction = app._format_transaction
+    def _format(i, *row):
+        formatted.append(i)
+        return format_transaction(i, *row)
+    monkeypatch.setattr(app, '_format_transaction', _format)
+    history = app.get_transactions()
+    assert len(formatted) == app.MAX_DISPLAYED_TRANSACTIONS
+    assert formatted[0] == 502
+    assert history.endswith("1501. Deposit: $1.00\n")
+    app.deposit('2')
+    app.get_transactions()
+    assert formatted[-1] == 1502
+    assert len(formatted) == app.MAX_DISPLAYED_TRANSACTIONS + 1
+
+def test_account_info_header_follows_balance(funded):
+    assert "Cash Balance: $10000.00\n" in app.get_account_info()
+    app.withdraw('2500')
+    info = app.get_account_info()
+    assert "Cash Balance: $7500.00\n" in info
+    assert "Loss: $2500.00\n" in info
+
+def test_account_info_holdings_follow_trades(funded):
+    assert app.get_account_info().endswith("\nHoldings:\nNo holdings\n")
+    app.buy_shares('AAPL', '10')
+    assert app.get_account_info().endswith("AAPL: 10 shares at $150.00 each = $1500.00\n")
+    app.sell_shares('AAPL', '4')
+    assert app.get_account_info().endswith("AAPL: 6 shares at $150.00 each = $900.00\n")
+
+def test_account_info_after_price_refresh(funded, prices):
+    app.buy_shares('AAPL', '10')
+    app.get_account_info()
+    prices['AAPL'] = 200.0
+    accounts.refresh_prices()
+    info = app.get_account_info()
+    assert "Portfolio Value: $10500.00\nProfit: $500.00\n" in info
+    assert info.endswith("AAPL: 10 shares at $200.00 each = $2000.00\n")